@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import asyncio
+import logging
+import pathlib
+import queue
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from geointel import GeoIntel
+from geointel.json_utils import dumps
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("geointel.examples")
+
+
+def analyze_single_image(geointel: GeoIntel, image_path: str) -> Dict[str, Any]:
+    logger.info("Analyzing image: %s", image_path)
+    try:
+        result = geointel.locate(image_path=image_path)
+        if "error" in result:
+            logger.warning("Analysis failed for %s: %s", image_path, result["error"])
+        return result
+    except Exception as e:
+        # Plain error, not logger.exception: tracebacks add up over large batches
+        logger.error("Unexpected error analyzing %s: %s", image_path, e)
+        return {"error": "Unexpected error", "details": str(e)}
+
+
+async def batch_analyze_images_async(
+    geointel: GeoIntel,
+    image_paths: List[str],
+    max_concurrent: int = 8
+) -> List[Dict[str, Any]]:
+    # Each locate() call is almost entirely spent waiting on the Gemini API,
+    # so run them in worker threads and cap how many are in flight at once.
+    semaphore = asyncio.Semaphore(max_concurrent)
+    loop = asyncio.get_running_loop()
+    total = len(image_paths)
+
+    async def _analyze(index: int, image_path: str) -> Dict[str, Any]:
+        async with semaphore:
+            logger.info("Processing image %d/%d", index, total)
+            result = await loop.run_in_executor(
+                None, analyze_single_image, geointel, image_path
+            )
+            return {"image_path": image_path, "result": result}
+
+    # gather() preserves input order, so results line up with image_paths
+    outcomes = await asyncio.gather(
+        *[_analyze(i, path) for i, path in enumerate(image_paths, 1)],
+        return_exceptions=True
+    )
+
+    results = []
+    for image_path, outcome in zip(image_paths, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Batch task failed for %s: %s", image_path, outcome)
+            outcome = {
+                "image_path": image_path,
+                "result": {"error": "Unexpected error", "details": str(outcome)}
+            }
+        results.append(outcome)
+    return results
+
+
+class ResultWriter:
+    """Append results to a newline-delimited JSON file from a background thread.
+
+    submit() only enqueues, so the analysis loop never waits on disk I/O.
+    If a write fails, the error is re-raised from the next submit() or close().
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, output_path: str, max_pending: int = 128):
+        self.output_path = output_path
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._file = open(output_path, "wb")
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._CLOSE:
+                    return
+                if self._error is not None:
+                    continue  # Keep draining so producers never block on a full queue
+                try:
+                    self._file.write(dumps(item))
+                    self._file.write(b"\n")
+                    self._file.flush()
+                except Exception as e:
+                    logger.error("Result writer failed for %s: %s", self.output_path, e)
+                    self._error = e
+        finally:
+            self._file.close()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, result: Dict[str, Any]) -> None:
+        self._raise_error()
+        self._queue.put(result)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._CLOSE)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def batch_analyze_images(
+    geointel: GeoIntel,
+    image_paths: List[str],
+    max_workers: int = 5,
+    writer: Optional[ResultWriter] = None
+) -> List[Dict[str, Any]]:
+    # locate_iter runs locate() on a thread pool; the client's rate limiter
+    # still paces requests across workers. Results arrive as they complete.
+    results = []
+    for done, entry in enumerate(geointel.locate_iter(image_paths, max_workers=max_workers), 1):
+        if "error" in entry["result"]:
+            logger.warning("Analysis failed for %s: %s", entry["image_path"], entry["result"]["error"])
+        if writer is not None:
+            writer.submit(entry)
+        logger.info("Completed image %d/%d", done, len(image_paths))
+        results.append(entry)
+    return results
+
+
+def save_results(results: Iterable[Dict[str, Any]], output_path: str) -> None:
+    # Accepts any iterable, e.g. geointel.locate_iter(...), and writes each
+    # result as one line as soon as it arrives
+    count = 0
+    with open(output_path, "wb") as f:
+        for result in results:
+            f.write(dumps(result) + b"\n")
+            count += 1
+    logger.info("Saved %d results to %s", count, output_path)
+
+
+if __name__ == "__main__":
+    # Images to analyze can be passed on the command line; defaults to the sample image
+    image_paths = sys.argv[1:] or [
+        str(pathlib.Path(__file__).resolve().parent.parent / "kule.jpg")
+    ]
+
+    geointel = GeoIntel()  # Uses GEMINI_API_KEY from environment
+    # Each result is written as soon as it completes, one JSON object per line
+    with ResultWriter("geointel_batch_results.jsonl") as writer:
+        results = batch_analyze_images(geointel, image_paths, writer=writer)
+
+    for entry in results:
+        result = entry["result"]
+        if "error" in result:
+            print(f"{entry['image_path']}: {result['error']}")
+            continue
+        top = result["locations"][0]
+        print(f"{entry['image_path']}: {top['city']}, {top['country']} ({top['confidence']})")
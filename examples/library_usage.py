@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 from geointel import GeoIntel
-import os 
 import pathlib
 import json
 
@@ -8,7 +7,7 @@ import json
 geointel = GeoIntel(api_key="your_api_key_here")
 
 # Analyze a local image
-image_path = os.path.join(pathlib.Path(__file__).parent.parent, "kule.jpg")
+image_path = str(pathlib.Path(__file__).resolve().parent.parent / "kule.jpg")
 result = geointel.locate(image_path=image_path)
 
 # For this example, let's show how to access the data
@@ -1,4 +1,5 @@
-from .geointel import GeoIntel
+from typing import TYPE_CHECKING, Any
+
 from .exceptions import (
     GeoIntelError,
     APIError,
@@ -9,6 +10,9 @@ from .exceptions import (
     ResponseParsingError,
 )
 
+if TYPE_CHECKING:
+    from .geointel import GeoIntel
+
 __version__ = "0.2.0"
 __all__ = [
     "GeoIntel",
@@ -19,4 +23,12 @@ __all__ = [
     "InvalidImageError",
     "NetworkError",
     "ResponseParsingError",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    # GeoIntel pulls in requests and friends; only import it on first use
+    if name == "GeoIntel":
+        from .geointel import GeoIntel
+        return GeoIntel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
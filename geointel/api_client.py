@@ -1,25 +1,97 @@
+import asyncio
+import gzip
 import os
-from typing import Any, Dict, Optional
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # Only needed for AsyncGeminiClient
+    httpx = None
 
 from .config import (
+    API_HEADERS,
+    API_MAX_ATTEMPTS,
     API_TIMEOUT,
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_KEEPALIVE_CONNECTIONS,
     AVAILABLE_MODELS,
+    COMPRESS_REQUESTS,
+    COMPRESSION_MIN_BYTES,
+    COMPRESSION_REJECTED_STATUS_CODES,
+    DEFAULT_MIME_TYPE,
+    DEFAULT_REQUESTS_PER_SECOND,
     DEFAULT_TEMPERATURE,
     DEFAULT_TOP_K,
     DEFAULT_TOP_P,
     ENV_API_KEY,
     GEMINI_API_BASE_URL,
+    GEMINI_API_ROOT_URL,
     GEMINI_MODEL,
+    GEMINI_UPLOAD_URL,
+    GZIP_COMPRESS_LEVEL,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
     MAX_OUTPUT_TOKENS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRYABLE_STATUS_CODES,
+    TRANSPORT_BACKOFF_FACTOR,
+    TRANSPORT_MAX_RETRIES,
+    TRANSPORT_RETRY_STATUS_CODES,
+    WARMUP_TIMEOUT,
 )
+from .cache import ResponseCache
 from .exceptions import APIError, APIKeyError
+from .json_utils import dumps, loads
 from .logger import logger
 
 
+class RateLimiter:
+    """Enforce a minimum interval between calls, shared across threads."""
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next free slot and return how long to wait for it."""
+        # Reserve under the lock, sleep outside it, so concurrent callers
+        # queue up one interval apart
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        return slot - now
+
+    def wait(self) -> None:
+        sleep_for = self.reserve()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+    async def wait_async(self) -> None:
+        sleep_for = self.reserve()
+        if sleep_for > 0:
+            await asyncio.sleep(sleep_for)
+
+
 class GeminiClient:
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        rps: float = DEFAULT_REQUESTS_PER_SECOND,
+        warmup: bool = False
+    ):
         self.api_key = api_key or os.environ.get(ENV_API_KEY)
         if not self.api_key or self.api_key == "your_api_key_here":
             raise APIKeyError(
@@ -33,49 +105,146 @@ class GeminiClient:
             self.model = model
         else:
             self.model = GEMINI_MODEL
+        self.rate_limiter = RateLimiter(rps)
+        self.generation_config = {
+            "temperature": DEFAULT_TEMPERATURE,
+            "topK": DEFAULT_TOP_K,
+            "topP": DEFAULT_TOP_P,
+            "maxOutputTokens": MAX_OUTPUT_TOKENS
+        }
+
+        # Identical requests already in flight, keyed by the caller's request_key
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Endpoint and headers never change for a client, build them once
+        self.endpoint_url = self._build_endpoint_url()
+        self.headers = self._get_request_headers()
+        self.gzip_headers = {**self.headers, "Content-Encoding": "gzip"}
+        self._template = b""
+        self._template_config: Optional[Dict[str, Any]] = None
+        self.compress_requests = COMPRESS_REQUESTS
+
+        # Reuse one keep-alive connection pool so repeat calls skip the TCP/TLS handshake
+        self.session = self._create_session()
+        if warmup:
+            # Resolve DNS and finish the TLS handshake while the caller is still
+            # loading and encoding the image, so the first POST reuses the socket
+            threading.Thread(target=self._warmup, daemon=True).start()
         logger.info(f"Initialized Gemini client with model: {self.model}")
 
+    def _warmup(self) -> None:
+        try:
+            self.session.head(GEMINI_API_ROOT_URL, timeout=WARMUP_TIMEOUT)
+            logger.debug("Gemini API connection pre-warmed")
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Connection pre-warm failed: {e}")
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        # 429/503 are left to _post_with_retry so they respect the rate limiter.
+        # Read errors are never retried: the POST may already have been
+        # processed (and billed), and each attempt can wait out API_TIMEOUT.
+        retry = Retry(
+            total=TRANSPORT_MAX_RETRIES,
+            connect=TRANSPORT_MAX_RETRIES,
+            read=False,
+            status=TRANSPORT_MAX_RETRIES,
+            backoff_factor=TRANSPORT_BACKOFF_FACTOR,
+            status_forcelist=TRANSPORT_RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
+
     def _build_endpoint_url(self) -> str:
         return f"{self.base_url}/{self.model}:generateContent"
 
-    def _build_request_payload(
+    def _body_template(self) -> bytes:
+        # The single-image body only varies in prompt, MIME type and image
+        # data, so serialize the rest once and splice those in per request.
+        # Rebuilt if generation_config is changed after construction.
+        if self._template_config != self.generation_config:
+            skeleton = self._build_multi_image_payload("\0prompt", [("\0data", "\0mime")])
+            template = dumps(skeleton).replace(b"%", b"%%")
+            for placeholder in (b'"\\u0000prompt"', b'"\\u0000mime"', b'"\\u0000data"'):
+                template = template.replace(placeholder, b"%b")
+            self._template = template
+            self._template_config = dict(self.generation_config)
+        return self._template
+
+    def _build_request_body(
         self,
         prompt: str,
         image_base64: str,
-        mime_type: str = "image/jpeg"
+        mime_type: str = DEFAULT_MIME_TYPE
+    ) -> bytes:
+        """Serialized single-image request body, equivalent to dumps() of the payload."""
+        # Base64 never needs JSON escaping, so the image is quoted as-is
+        # instead of being scanned by the serializer
+        return self._body_template() % (
+            dumps(prompt), dumps(mime_type), b'"' + image_base64.encode("ascii") + b'"'
+        )
+
+    def _build_multi_image_payload(
+        self,
+        prompt: str,
+        images: List[Tuple[str, str]]
     ) -> Dict[str, Any]:
-        return {
-            "contents": [
-                {
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": mime_type,
-                                "data": image_base64
-                            }
-                        }
-                    ]
+        parts: List[Dict[str, Any]] = [{"text": prompt}]
+        for image_base64, mime_type in images:
+            parts.append({
+                "inline_data": {
+                    "mime_type": mime_type,
+                    "data": image_base64
                 }
-            ],
-            "generationConfig": {
-                "temperature": DEFAULT_TEMPERATURE,
-                "topK": DEFAULT_TOP_K,
-                "topP": DEFAULT_TOP_P,
-                "maxOutputTokens": MAX_OUTPUT_TOKENS
-            }
+            })
+        return {
+            "contents": [{"parts": parts}],
+            "generationConfig": self.generation_config
         }
 
-    def _get_request_headers(self) -> Dict[str, str]:
+    def _build_file_payload(
+        self,
+        prompt: str,
+        file_uri: str,
+        mime_type: str
+    ) -> Dict[str, Any]:
         return {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self.api_key
+            "contents": [{"parts": [
+                {"text": prompt},
+                {"file_data": {"mime_type": mime_type, "file_uri": file_uri}}
+            ]}],
+            "generationConfig": self.generation_config
         }
 
+    def request_key(
+        self,
+        prompt: str,
+        image: Union[str, bytes],
+        mime_type: str = DEFAULT_MIME_TYPE
+    ) -> str:
+        """Content-addressed key identifying a request for response caching."""
+        return ResponseCache.make_key(
+            image, prompt, self.model, self.generation_config, mime_type,
+            api_key=self.api_key
+        )
+
+    def _get_request_headers(self) -> Dict[str, str]:
+        return {**API_HEADERS, "x-goog-api-key": self.api_key}
+
     def _extract_response_text(self, response_data: Dict[str, Any]) -> str:
         try:
-            # Log the full response structure for debugging
-            logger.debug(f"Full API response structure: {response_data}")
+            # Log the full response structure for debugging; lazy %-args so
+            # the repr of the whole response is only built when DEBUG is on
+            logger.debug("Full API response structure: %s", response_data)
             
             # Check if candidates exist
             if "candidates" not in response_data:
@@ -86,14 +255,14 @@ class GeminiClient:
                 raise APIError("Empty candidates array in API response")
             
             candidate = candidates[0]
-            logger.debug(f"First candidate structure: {candidate}")
+            logger.debug("First candidate structure: %s", candidate)
             
             # Check if content exists
             if "content" not in candidate:
                 raise APIError("No 'content' field in candidate")
             
             content = candidate["content"]
-            logger.debug(f"Content structure: {content}")
+            logger.debug("Content structure: %s", content)
             
             # Handle different content structures
             if "parts" in content:
@@ -156,41 +325,209 @@ class GeminiClient:
             logger.error(f"Full response: {response_data}")
             raise APIError(f"Invalid API response structure: '{e}' - Full response logged for debugging")
 
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return True
+        if response.status_code == 200:
+            return False
+        body = response.text.lower()
+        return "quota" in body or "rate limit" in body
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt))
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, delay)
+
+    def _post(
+        self,
+        endpoint_url: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> requests.Response:
+        self.rate_limiter.wait()
+        logger.info("Sending request to Gemini API")
+        return self.session.post(
+            endpoint_url,
+            headers=headers,
+            data=body,
+            timeout=API_TIMEOUT
+        )
+
+    def _post_with_retry(
+        self,
+        endpoint_url: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> requests.Response:
+        response = self._post(endpoint_url, headers, body)
+        for attempt in range(API_MAX_ATTEMPTS - 1):
+            if not self._is_rate_limited(response):
+                break
+            delay = self._backoff_delay(attempt)
+            logger.warning(
+                f"Gemini API rate limited (status {response.status_code}), "
+                f"retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            response = self._post(endpoint_url, headers, body)
+        return response
+
     def generate_content(
         self,
         prompt: str,
         image_base64: str,
-        mime_type: str = "image/jpeg"
+        mime_type: str = DEFAULT_MIME_TYPE,
+        request_key: Optional[str] = None
     ) -> str:
-        endpoint_url = self._build_endpoint_url()
-        headers = self._get_request_headers()
-        payload = self._build_request_payload(prompt, image_base64, mime_type)
+        # Callers passing the same request_key at the same time share one API
+        # call instead of each spending quota on it. Without a key there is
+        # nothing to share, and hashing the whole payload here would tax
+        # every single-image call.
+        if request_key is None:
+            body = self._build_request_body(prompt, image_base64, mime_type)
+            return self._send(body)
+
+        key = request_key
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            logger.info("Waiting on identical in-flight Gemini request")
+            return future.result()
 
         try:
-            logger.info("Sending request to Gemini API")
-            response = requests.post(
-                endpoint_url,
-                headers=headers,
-                json=payload,
-                timeout=API_TIMEOUT
-            )
+            body = self._build_request_body(prompt, image_base64, mime_type)
+            text = self._send(body)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
 
-            # Check for HTTP errors
-            if response.status_code != 200:
-                error_msg = f"API request failed with status {response.status_code}"
-                # Extract structured error message without exposing raw response
-                try:
-                    err_data = response.json()
-                    detail = err_data.get("error", {}).get("message", "Unknown error")
-                except Exception:
-                    detail = "Could not parse error response"
-                logger.error(f"{error_msg}: {detail}")
-                raise APIError(f"{error_msg}: {detail}")
-
-            # Parse and extract response
-            response_data = response.json()
-            logger.info("Successfully received API response")
-            return self._extract_response_text(response_data)
+    def generate_batch_content(
+        self,
+        prompt: str,
+        images: List[Tuple[str, str]]
+    ) -> str:
+        """Send several (image_base64, mime_type) images in a single request."""
+        payload = self._build_multi_image_payload(prompt, images)
+        return self._send(payload)
+
+    def upload_file(self, image_data: bytes, mime_type: str = DEFAULT_MIME_TYPE) -> str:
+        """Upload raw image bytes through the Gemini Files API and return the file URI.
+
+        Sends the bytes as-is in a multipart/related body, avoiding the base64
+        expansion of inline image data.
+        """
+        boundary = uuid.uuid4().hex
+        body = b"".join((
+            f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode("ascii"),
+            dumps({"file": {"mime_type": mime_type}}),
+            f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n".encode("ascii"),
+            image_data,
+            f"\r\n--{boundary}--\r\n".encode("ascii"),
+        ))
+        headers = {
+            "x-goog-api-key": self.api_key,
+            "X-Goog-Upload-Protocol": "multipart",
+            "Content-Type": f"multipart/related; boundary={boundary}",
+        }
+
+        try:
+            logger.info(f"Uploading {len(image_data)} byte image to Gemini Files API")
+            response = self._post_with_retry(GEMINI_UPLOAD_URL, headers, body)
+            self._check_status(response)
+            return loads(response.content)["file"]["uri"]
+
+        except APIError:
+            raise
+        except requests.exceptions.Timeout:
+            raise APIError("File upload timed out")
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"File upload failed: {e}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise APIError(f"Invalid file upload response: {e}")
+
+    def generate_content_from_file(
+        self,
+        prompt: str,
+        image_data: bytes,
+        mime_type: str = DEFAULT_MIME_TYPE
+    ) -> str:
+        """Upload the image with upload_file() and analyze it by file URI."""
+        file_uri = self.upload_file(image_data, mime_type)
+        return self._send(self._build_file_payload(prompt, file_uri, mime_type))
+
+    @staticmethod
+    def _check_status(response: Any) -> None:
+        if response.status_code != 200:
+            error_msg = f"API request failed with status {response.status_code}"
+            # Extract structured error message without exposing raw response
+            try:
+                err_data = loads(response.content)
+                detail = err_data.get("error", {}).get("message", "Unknown error")
+            except Exception:
+                detail = "Could not parse error response"
+            logger.error(f"{error_msg}: {detail}")
+            raise APIError(f"{error_msg}: {detail}")
+
+    def _handle_response(self, response: Any) -> str:
+        # Works for both requests and httpx responses
+        self._check_status(response)
+
+        # Parse and extract response
+        # Decode straight from the body bytes instead of response.json()
+        response_data = loads(response.content)
+        logger.info("Successfully received API response")
+        return self._extract_response_text(response_data)
+
+    def _encode_body(
+        self,
+        payload: Union[Dict[str, Any], bytes],
+        compress: bool = True
+    ) -> Tuple[bytes, Dict[str, str], bool]:
+        """Serialize (and usually gzip) a payload; returns (body, headers, compressed)."""
+        # Serialize once up front; retries resend the same bytes and requests
+        # skips its own json.dumps pass over the multi-megabyte image data
+        body = payload if isinstance(payload, bytes) else dumps(payload)
+        if not (compress and self.compress_requests) or len(body) < COMPRESSION_MIN_BYTES:
+            return body, self.headers, False
+        # Upload time dominates on typical uplinks and base64 text compresses well
+        return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL), self.gzip_headers, True
+
+    @staticmethod
+    def _compression_suspect(response: Any, compressed: bool) -> bool:
+        """Whether a failed gzip request is worth one uncompressed resend."""
+        # The endpoint may reject the encoding with an ordinary 400, which
+        # looks exactly like a bad prompt, image or key
+        return compressed and response.status_code in COMPRESSION_REJECTED_STATUS_CODES
+
+    def _check_uncompressed_retry(self, response: Any) -> None:
+        # Only an uncompressed success proves gzip was the problem; a real
+        # request error fails both ways and leaves compression on
+        if response.status_code < 400:
+            logger.warning("Gemini API rejected the gzip request body, sending uncompressed from now on")
+            self.compress_requests = False
+
+    def _send(self, payload: Union[Dict[str, Any], bytes]) -> str:
+        body, headers, compressed = self._encode_body(payload)
+
+        try:
+            response = self._post_with_retry(self.endpoint_url, headers, body)
+            if self._compression_suspect(response, compressed):
+                body, headers, _ = self._encode_body(payload, compress=False)
+                response = self._post_with_retry(self.endpoint_url, headers, body)
+                self._check_uncompressed_retry(response)
+            return self._handle_response(response)
 
         except requests.exceptions.Timeout:
             raise APIError("API request timed out")
@@ -199,3 +536,103 @@ class GeminiClient:
         except Exception as e:
             logger.error(f"Unexpected error during API call: {e}")
             raise APIError(f"Unexpected error: {e}") from e
+
+
+class AsyncGeminiClient:
+    """Asynchronous counterpart of GeminiClient built on httpx.
+
+    Concurrent requests share HTTP/2 connections as multiplexed streams
+    instead of each holding a connection of its own. Request building,
+    rate limiting and response handling come from the wrapped GeminiClient.
+    Requires the optional ``httpx[http2]`` dependency.
+    """
+
+    def __init__(self, client: GeminiClient):
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for async requests. "
+                "Install it with: pip install 'geointel[async]'"
+            )
+        self.client = client
+        limits = httpx.Limits(
+            max_connections=ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        try:
+            self.session = httpx.AsyncClient(
+                http2=True, timeout=API_TIMEOUT, limits=limits
+            )
+        except ImportError:
+            # http2=True needs the h2 package; HTTP/1.1 pooling still helps
+            logger.warning("h2 not installed, falling back to HTTP/1.1")
+            self.session = httpx.AsyncClient(timeout=API_TIMEOUT, limits=limits)
+
+    async def __aenter__(self) -> "AsyncGeminiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    async def _post(self, body: bytes, headers: Dict[str, str]) -> Any:
+        await self.client.rate_limiter.wait_async()
+        logger.info("Sending request to Gemini API")
+        return await self.session.post(
+            self.client.endpoint_url,
+            headers=headers,
+            content=body
+        )
+
+    async def _post_with_retry(self, body: bytes, headers: Dict[str, str]) -> Any:
+        response = await self._post(body, headers)
+        for attempt in range(API_MAX_ATTEMPTS - 1):
+            if not self.client._is_rate_limited(response):
+                break
+            delay = self.client._backoff_delay(attempt)
+            logger.warning(
+                f"Gemini API rate limited (status {response.status_code}), "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            response = await self._post(body, headers)
+        return response
+
+    async def _send(self, payload: Union[Dict[str, Any], bytes]) -> str:
+        body, headers, compressed = self.client._encode_body(payload)
+
+        try:
+            response = await self._post_with_retry(body, headers)
+            if self.client._compression_suspect(response, compressed):
+                body, headers, _ = self.client._encode_body(payload, compress=False)
+                response = await self._post_with_retry(body, headers)
+                self.client._check_uncompressed_retry(response)
+            return self.client._handle_response(response)
+
+        except httpx.TimeoutException:
+            raise APIError("API request timed out")
+        except httpx.HTTPError as e:
+            raise APIError(f"API request failed: {e}")
+        except APIError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during API call: {e}")
+            raise APIError(f"Unexpected error: {e}") from e
+
+    async def generate_content(
+        self,
+        prompt: str,
+        image_base64: str,
+        mime_type: str = DEFAULT_MIME_TYPE
+    ) -> str:
+        body = self.client._build_request_body(prompt, image_base64, mime_type)
+        return await self._send(body)
+
+    async def generate_batch_content(
+        self,
+        prompt: str,
+        images: List[Tuple[str, str]]
+    ) -> str:
+        payload = self.client._build_multi_image_payload(prompt, images)
+        return await self._send(payload)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .config import (
+    CACHE_DIR_NAME,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    ENV_CACHE_DIR,
+)
+from .logger import logger
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get(ENV_CACHE_DIR)
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / CACHE_DIR_NAME
+
+
+class ResponseCache:
+    """On-disk cache of parsed analysis results, one JSON file per key.
+
+    Entries expire ``ttl`` seconds after they were written and the oldest
+    entries are evicted once ``max_entries`` is exceeded. Cache failures are
+    logged and otherwise ignored so they never break an analysis.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        ttl: int = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES
+    ):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(
+        image: Union[str, bytes],
+        prompt: str,
+        model: str,
+        generation_config: Dict[str, Any],
+        mime_type: str,
+        api_key: str = ""
+    ) -> str:
+        # Accepts base64 text or raw image bytes. The API key is part of the
+        # key so callers sharing a cache directory never see each other's results.
+        data = image.encode("ascii") if isinstance(image, str) else image
+        image_digest = hashlib.sha256(data).hexdigest()
+        request_digest = hashlib.sha256(
+            "\0".join((
+                model,
+                mime_type,
+                json.dumps(generation_config, sort_keys=True),
+                prompt,
+                hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+            )).encode("utf-8")
+        ).hexdigest()
+        return f"{image_digest}-{request_digest}"
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path_for(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink()
+                return None
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            logger.debug("Cache hit: %s", key)
+            return value
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(value, f, ensure_ascii=False)
+                os.replace(tmp_path, self._path_for(key))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+            self._evict()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+
+    def _evict(self) -> None:
+        entries = list(self.directory.glob("*.json"))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,10 +1,11 @@
 import argparse
-import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, NoReturn
+from typing import Any, Dict, Iterator, NoReturn
 
-from .geointel import GeoIntel
+from .config import ENV_NO_BANNER, URL_PREFIXES
 from .exceptions import GeoIntelError
 
 
@@ -18,8 +19,7 @@ class Colors:
     RESET = "\033[0m"
 
 
-def print_banner() -> None:
-    banner = r"""
+_BANNER = r"""
                  _      __      __
   ___ ____ ___  (_)__  / /____ / /
  / _ `/ -_) _ \/ / _ \/ __/ -_) /
@@ -31,8 +31,22 @@ Uncover the location of photos using AI
 ----------------------------------------
 # Disclaimer: Experimental use only. Not for production.
 # Github: https://github.com/atiilla/geointel
+
 """
-    print(banner)
+_BANNER_BYTES = _BANNER.encode("utf-8")
+
+
+def print_banner(quiet: bool = False) -> None:
+    # Keep piped output and scripted runs clean
+    if quiet or os.environ.get(ENV_NO_BANNER) or not sys.stdout.isatty():
+        return
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(_BANNER)
+        return
+    # Pre-encoded, so skip the text layer; flush it first to keep ordering
+    sys.stdout.flush()
+    buffer.write(_BANNER_BYTES)
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -91,6 +105,16 @@ Examples:
         type=str,
         help="Custom Gemini API key (overrides GEMINI_API_KEY env var)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the API instead of reusing cached results"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help=f"Suppress the banner and progress messages (or set {ENV_NO_BANNER})"
+    )
 
     return parser
 
@@ -108,13 +132,15 @@ def validate_output_path(output_path: str) -> None:
         print(f"{Colors.YELLOW}Warning: File will be overwritten: {output_path}{Colors.RESET}")
 
 
+_CONFIDENCE_COLORS = {
+    "High": Colors.GREEN,
+    "Medium": Colors.YELLOW,
+    "Low": Colors.RED
+}
+
+
 def get_confidence_color(confidence: str) -> str:
-    confidence_colors = {
-        "High": Colors.GREEN,
-        "Medium": Colors.YELLOW,
-        "Low": Colors.RED
-    }
-    return confidence_colors.get(confidence, Colors.RESET)
+    return _CONFIDENCE_COLORS.get(confidence, Colors.RESET)
 
 
 def format_location_info(location: Dict[str, Any]) -> str:
@@ -122,79 +148,117 @@ def format_location_info(location: Dict[str, Any]) -> str:
     state = location.get("state", "")
     country = location.get("country", "Unknown")
 
-    parts = [city]
     if state:
-        parts.append(state)
-    parts.append(country)
+        return f"{city}, {state}, {country}"
+    return f"{city}, {country}"
 
-    return ", ".join(parts)
 
+@lru_cache(maxsize=256)
+def get_google_maps_url(lat: float, lng: float) -> str:
+    # Callers range-check first, so NaN (which never hits the cache) can't reach here
+    return f"https://www.google.com/maps?q={lat:.6f},{lng:.6f}"
 
-def display_results(results: Dict[str, Any]) -> None:
-    print(f"\n{Colors.GREEN}===== Analysis Results ====={Colors.RESET}")
 
-    # Display interpretation
-    print(f"\n{Colors.CYAN}Interpretation:{Colors.RESET}")
-    print(results.get("interpretation", "No interpretation available"))
+def format_location(index: int, location: Dict[str, Any]) -> str:
+    confidence = location.get("confidence", "Unknown")
+    confidence_color = get_confidence_color(confidence)
 
-    # Display locations
-    print(f"\n{Colors.CYAN}Possible Locations:{Colors.RESET}")
-    locations = results.get("locations", [])
+    parts = [
+        f"\n{index}. {format_location_info(location)}\n",
+        f"   Confidence: {confidence_color}{confidence}{Colors.RESET}\n",
+    ]
+
+    # Display coordinates and map link
+    coordinates = location.get("coordinates")
+    if coordinates:
+        lat = coordinates.get("latitude", 0)
+        lng = coordinates.get("longitude", 0)
+        if lat != 0 or lng != 0:
+            # Display coordinates — intentional CLI output, not logging to a file
+            # Out-of-range values would only produce a broken map link
+            if (
+                isinstance(lat, (int, float)) and isinstance(lng, (int, float))
+                and -90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0
+            ):
+                lat_safe = float(lat)
+                lng_safe = float(lng)
+                parts.append(f"   Coordinates: {lat_safe:.6f}, {lng_safe:.6f}\n")
+                parts.append(f"   Google Maps: {get_google_maps_url(lat_safe, lng_safe)}\n")
+
+    # Display explanation
+    explanation = location.get("explanation", "No explanation available")
+    parts.append(f"   Explanation: {explanation}")
+
+    return "".join(parts)
 
+
+_RESULTS_HEADER = (
+    f"\n{Colors.GREEN}===== Analysis Results ====={Colors.RESET}\n"
+    f"\n{Colors.CYAN}Interpretation:{Colors.RESET}\n"
+)
+_LOCATIONS_HEADER = f"\n{Colors.CYAN}Possible Locations:{Colors.RESET}\n"
+
+
+def _iter_results(results: Dict[str, Any]) -> Iterator[str]:
+    yield _RESULTS_HEADER
+    yield f"{results.get('interpretation', 'No interpretation available')}\n"
+    yield _LOCATIONS_HEADER
+
+    locations = results.get("locations", [])
     if not locations:
-        print("No locations identified")
+        yield "No locations identified\n"
         return
 
     for i, location in enumerate(locations, 1):
-        confidence = location.get("confidence", "Unknown")
-        confidence_color = get_confidence_color(confidence)
-
-        print(f"\n{i}. {format_location_info(location)}")
-        print(f"   Confidence: {confidence_color}{confidence}{Colors.RESET}")
-
-        # Display coordinates and map link
-        coordinates = location.get("coordinates")
-        if coordinates:
-            lat = coordinates.get("latitude", 0)
-            lng = coordinates.get("longitude", 0)
-            if lat != 0 or lng != 0:
-                # Display coordinates — intentional CLI output, not logging to a file
-                if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
-                    lat_safe = float(lat)
-                    lng_safe = float(lng)
-                    print(f"   Coordinates: {lat_safe:.6f}, {lng_safe:.6f}")
-                    print(f"   Google Maps: https://www.google.com/maps?q={lat_safe:.6f},{lng_safe:.6f}")
-
-        # Display explanation
-        explanation = location.get("explanation", "No explanation available")
-        print(f"   Explanation: {explanation}")
+        yield format_location(i, location)
+        yield "\n"
 
 
-def display_error(results: Dict[str, Any]) -> NoReturn:
-    print(f"\n{Colors.RED}Error: {results['error']}{Colors.RESET}")
+def display_results(results: Dict[str, Any]) -> None:
+    # Joined rather than writelines(): a line-buffered TTY would flush per chunk
+    sys.stdout.write("".join(_iter_results(results)))
+    sys.stdout.flush()
+
+
+def format_error(results: Dict[str, Any]) -> str:
+    parts = [f"\n{Colors.RED}Error: {results['error']}{Colors.RESET}"]
 
     if "details" in results:
-        print(f"Details: {results['details']}")
+        parts.append(f"\nDetails: {results['details']}")
 
+    return "".join(parts)
+
+
+def display_error(results: Dict[str, Any]) -> NoReturn:
+    print(format_error(results))
     sys.exit(1)
 
 
 def save_results(results: Dict[str, Any], output_path: str) -> None:
+    from .json_utils import dumps_pretty
+
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        data = memoryview(dumps_pretty(results))
+        # Already serialized in full, so hand it to the OS without a buffered file
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(output_path, flags, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
         print(f"\n{Colors.GREEN}Results saved to: {output_path}{Colors.RESET}")
     except Exception as e:
         print(f"{Colors.RED}Failed to save results: {e}{Colors.RESET}")
 
 
 def main() -> None:
-    print_banner()
-
     # Parse arguments
     parser = create_argument_parser()
     args = parser.parse_args()
 
+    print_banner(quiet=args.quiet)
+
     # Check if web interface mode
     if args.web:
         print(f"\n{Colors.CYAN}Starting GeoIntel Web Interface...{Colors.RESET}")
@@ -219,14 +283,18 @@ def main() -> None:
         validate_output_path(args.output)
 
     # Display processing info
-    print(f"\nAnalyzing image: {args.image}")
-    if args.image.startswith(('http://', 'https://')):
-        print("Downloading image from URL...")
-    print("This may take a few moments...")
+    if not args.quiet:
+        print(f"\nAnalyzing image: {args.image}")
+        if args.image.startswith(URL_PREFIXES):
+            print("Downloading image from URL...")
+        print("This may take a few moments...")
+
+    # Imported here so --help and argument errors don't pay for requests et al.
+    from .geointel import GeoIntel
 
     try:
         # Initialize GeoIntel
-        geointel = GeoIntel(api_key=args.api_key)
+        geointel = GeoIntel(api_key=args.api_key, cache=not args.no_cache, warmup=True)
 
         # Perform analysis
         results = geointel.locate(
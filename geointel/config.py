@@ -2,8 +2,33 @@ from typing import Final
 
 # API Configuration
 GEMINI_API_BASE_URL: Final[str] = "https://generativelanguage.googleapis.com/v1/models"
+GEMINI_API_ROOT_URL: Final[str] = "https://generativelanguage.googleapis.com/"
+GEMINI_UPLOAD_URL: Final[str] = "https://generativelanguage.googleapis.com/upload/v1beta/files"
+FILE_UPLOAD_MIN_BYTES: Final[int] = 1024 * 1024  # Below this, inline base64 beats an extra upload round trip
 GEMINI_MODEL: Final[str] = "gemini-3-flash-preview"  # Default model
 API_TIMEOUT: Final[int] = 90  # Pro models need more time for deep reasoning
+API_HEADERS: Final[dict] = {"Content-Type": "application/json"}  # Sent with every request
+
+# Rate Limiting & Retries
+DEFAULT_REQUESTS_PER_SECOND: Final[float] = 5.0
+API_MAX_ATTEMPTS: Final[int] = 3
+RETRY_BACKOFF_BASE: Final[float] = 1.0  # Seconds, doubled on every retry
+RETRY_BACKOFF_MAX: Final[float] = 30.0
+RETRYABLE_STATUS_CODES: Final[tuple] = (429, 503)
+
+# Connection Pooling
+HTTP_POOL_CONNECTIONS: Final[int] = 16
+HTTP_POOL_MAXSIZE: Final[int] = 32
+TRANSPORT_MAX_RETRIES: Final[int] = 3  # Connect errors and 5xx statuses, handled by urllib3; never read timeouts
+TRANSPORT_BACKOFF_FACTOR: Final[float] = 0.5
+TRANSPORT_RETRY_STATUS_CODES: Final[tuple] = (500, 502, 504)
+COMPRESS_REQUESTS: Final[bool] = True  # gzip request bodies; base64 image data shrinks ~25%
+GZIP_COMPRESS_LEVEL: Final[int] = 1  # Fastest level gets nearly all of the gain on base64
+COMPRESSION_MIN_BYTES: Final[int] = 64 * 1024  # Not worth it for tiny bodies
+COMPRESSION_REJECTED_STATUS_CODES: Final[tuple] = (400, 415)  # Resent once uncompressed; gzip is dropped only if that succeeds
+WARMUP_TIMEOUT: Final[int] = 2  # Seconds for the optional connection pre-warm request
+ASYNC_MAX_CONNECTIONS: Final[int] = 32
+ASYNC_MAX_KEEPALIVE_CONNECTIONS: Final[int] = 16
 
 # Available models (id -> display name)
 AVAILABLE_MODELS: Final[dict] = {
@@ -21,8 +46,23 @@ MAX_OUTPUT_TOKENS: Final[int] = 16384
 
 # Image Processing
 SUPPORTED_IMAGE_FORMATS: Final[tuple] = ("jpeg", "jpg", "png", "webp", "gif")
+MIME_TYPES: Final[dict] = {  # Lower-case extension -> MIME type
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
 DEFAULT_MIME_TYPE: Final[str] = "image/jpeg"
+URL_PREFIXES: Final[tuple] = ("http://", "https://")  # Inputs treated as remote images
 IMAGE_DOWNLOAD_TIMEOUT: Final[int] = 10
+DOWNLOAD_POOL_CONNECTIONS: Final[int] = 16  # Distinct hosts kept alive for image downloads
+DOWNLOAD_POOL_MAXSIZE: Final[int] = 64
+DOWNLOAD_MAX_RETRIES: Final[int] = 3
+DOWNLOAD_BACKOFF_FACTOR: Final[float] = 0.3
+DOWNLOAD_RETRY_STATUS_CODES: Final[tuple] = (502, 503, 504)
+BASE64_CHUNK_SIZE: Final[int] = 3 * 64 * 1024  # Multiple of 3, so chunks encode without padding
+ENCODED_CACHE_MAX_BYTES: Final[int] = 64 * 1024 * 1024  # Recently encoded images kept in memory
 
 # Response Configuration
 MAX_LOCATIONS: Final[int] = 3
@@ -31,5 +71,25 @@ CONFIDENCE_LEVELS: Final[tuple] = ("High", "Medium", "Low")
 # Image Size Limits
 MAX_IMAGE_SIZE_BYTES: Final[int] = 20 * 1024 * 1024  # 20 MB
 
+# Thread-pool Batches (GeoIntel.locate_iter)
+DEFAULT_MAX_WORKERS: Final[int] = 5
+
+# Streaming Pipeline (GeoIntel.locate_stream)
+STREAM_FETCH_WORKERS: Final[int] = 4
+STREAM_ENCODE_WORKERS: Final[int] = 2
+STREAM_API_WORKERS: Final[int] = 8
+STREAM_QUEUE_SIZE: Final[int] = 16  # Bounds how many loaded images wait between stages
+
+# Multi-image Requests (GeoIntel.locate_combined)
+MAX_BATCH_IMAGES: Final[int] = 8
+MAX_BATCH_PAYLOAD_BYTES: Final[int] = 18 * 1024 * 1024  # Base64 bytes, under Gemini's 20 MB request cap
+
+# Response Cache
+CACHE_DIR_NAME: Final[str] = "geointel"  # Created under $XDG_CACHE_HOME or ~/.cache
+CACHE_TTL_SECONDS: Final[int] = 24 * 60 * 60  # 1 day
+CACHE_MAX_ENTRIES: Final[int] = 512
+
 # Environment Variables
 ENV_API_KEY: Final[str] = "GEMINI_API_KEY"
+ENV_CACHE_DIR: Final[str] = "GEOINTEL_CACHE_DIR"
+ENV_NO_BANNER: Final[str] = "GEOINTEL_NO_BANNER"
@@ -1,20 +1,158 @@
-from typing import Any, Dict, Optional
+import asyncio
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from .api_client import GeminiClient
+from .api_client import AsyncGeminiClient, GeminiClient
+from .cache import ResponseCache
+from .config import (
+    ASYNC_MAX_CONNECTIONS,
+    DEFAULT_MAX_WORKERS,
+    FILE_UPLOAD_MIN_BYTES,
+    HTTP_POOL_MAXSIZE,
+    MAX_BATCH_IMAGES,
+    MAX_BATCH_PAYLOAD_BYTES,
+    STREAM_API_WORKERS,
+    STREAM_ENCODE_WORKERS,
+    STREAM_FETCH_WORKERS,
+    STREAM_QUEUE_SIZE,
+)
 from .exceptions import GeoIntelError
 from .image_processor import ImageProcessor
 from .logger import logger
-from .prompts import get_geolocation_prompt
+from .prompts import get_batch_geolocation_prompt, get_geolocation_prompt
 from .response_parser import ResponseParser
 
+# Marks the end of input on the streaming pipeline queues
+_SENTINEL = object()
+
 
 class GeoIntel:
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
-        self.api_client = GeminiClient(api_key, model=model)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Union[bool, str, Path] = False,
+        warmup: bool = False,
+        upload_large_images: bool = False,
+        cache_local_images: bool = False
+    ):
+        self.api_client = GeminiClient(api_key, model=model, warmup=warmup)
+        # Opt-in: uploaded files are stored by Google for up to 48 hours
+        self.upload_large_images = upload_large_images
+        # Opt-in: keeps encoded local files in memory for repeat analyses
+        self.cache_local_images = cache_local_images
+        # True uses the default cache directory; a path uses that directory instead
+        if cache is True:
+            self.cache = ResponseCache()
+        else:
+            self.cache = ResponseCache(cache) if cache else None
         self.image_processor = ImageProcessor()
         self.response_parser = ResponseParser()
         logger.info("GeoIntel initialized successfully")
 
+    def _lookup_cache(
+        self,
+        prompt: str,
+        image: Union[str, bytes],
+        mime_type: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        # Identical image + prompt + model settings reuse the earlier result
+        if self.cache is None:
+            return None, None
+        cache_key = self.api_client.request_key(prompt, image, mime_type)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached location analysis")
+        return cache_key, cached
+
+    @staticmethod
+    def _inflight_key(image_path: str, prompt: str) -> str:
+        # Concurrent calls for the same image and prompt share one API request;
+        # the path is enough to spot them without hashing the image data
+        source = image_path if ImageProcessor.is_url(image_path) else os.path.abspath(image_path)
+        return f"{source}\0{prompt}"
+
+    def _analyze(
+        self,
+        image_base64: str,
+        mime_type: str,
+        prompt: str,
+        image_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        cache_key, cached = self._lookup_cache(prompt, image_base64, mime_type)
+        if cached is not None:
+            return cached
+
+        request_key = cache_key
+        if request_key is None and image_path is not None:
+            request_key = self._inflight_key(image_path, prompt)
+
+        # Call API with detected MIME type
+        raw_response = self.api_client.generate_content(
+            prompt=prompt,
+            image_base64=image_base64,
+            mime_type=mime_type,
+            request_key=request_key
+        )
+
+        # Parse response
+        result = self.response_parser.parse_response(raw_response)
+        logger.info("Location analysis completed successfully")
+
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+
+        return result
+
+    def _analyze_upload(self, image_data: bytes, mime_type: str, prompt: str) -> Dict[str, Any]:
+        cache_key, cached = self._lookup_cache(prompt, image_data, mime_type)
+        if cached is not None:
+            return cached
+
+        raw_response = self.api_client.generate_content_from_file(prompt, image_data, mime_type)
+        result = self.response_parser.parse_response(raw_response)
+        logger.info("Location analysis completed successfully")
+
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+
+        return result
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        if isinstance(error, GeoIntelError):
+            # Log detailed error on the server, but avoid exposing internal messages to clients
+            error_msg = f"{type(error).__name__}: {str(error)}"
+            logger.error(error_msg)
+            # Return a generic, user-safe error message without internal details
+            return {
+                "error": "GeoIntel processing error",
+                "details": type(error).__name__
+            }
+
+        # Log unexpected errors with full stack trace, but return a generic message to clients
+        error_msg = f"Unexpected error: {str(error)}"
+        logger.error(error_msg, exc_info=error)
+        # Return a generic message without including the raw exception string
+        return {
+            "error": "An unexpected error occurred",
+            "details": "Internal processing error"
+        }
+
     def locate(
         self,
         image_path: str,
@@ -24,40 +162,343 @@ class GeoIntel:
         try:
             logger.info(f"Starting location analysis for: {image_path}")
 
-            # Process image — returns (base64_data, mime_type)
-            image_base64, mime_type = self.image_processor.process_image(image_path)
-
             # Generate prompt
             prompt = get_geolocation_prompt(context_info, location_guess)
 
-            # Call API with detected MIME type
-            raw_response = self.api_client.generate_content(
+            if self.upload_large_images:
+                image_data = self.image_processor.load_image(image_path)
+                if len(image_data) >= FILE_UPLOAD_MIN_BYTES:
+                    # Large images go up as raw bytes instead of base64 in the JSON body
+                    mime_type = self.image_processor.detect_mime_type(image_data, image_path)
+                    return self._analyze_upload(image_data, mime_type, prompt)
+                image_base64, mime_type = self.image_processor.encode_image(image_data, image_path)
+            else:
+                # Process image — returns (base64_data, mime_type)
+                image_base64, mime_type = self.image_processor.process_image(
+                    image_path, self.cache_local_images
+                )
+
+            return self._analyze(image_base64, mime_type, prompt, image_path)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def locate_iter(
+        self,
+        image_paths: Iterable[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Iterator[Dict[str, Any]]:
+        """Analyze images on a thread pool, yielding {"image_path", "result"} as each completes.
+
+        Only a small window of images is in flight at a time and finished
+        results are released once yielded, so memory stays flat however many
+        paths are passed. Results arrive in completion order.
+        """
+        paths = iter(image_paths)
+        pending: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit_next() -> None:
+                for image_path in paths:
+                    future = executor.submit(self.locate, image_path, context_info, location_guess)
+                    pending[future] = image_path
+                    return
+
+            for _ in range(max_workers * 2):
+                submit_next()
+
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        image_path = pending.pop(future)
+                        submit_next()
+                        yield {"image_path": image_path, "result": future.result()}
+            finally:
+                # Consumer stopped early: drop work that hasn't started yet
+                for future in pending:
+                    future.cancel()
+
+    def locate_batch(
+        self,
+        image_paths: List[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[Dict[str, Any]]:
+        """Analyze images on a thread pool and return {"image_path", "result"} entries in input order."""
+        # The pool doesn't block: workers beyond its size would open extra
+        # connections and throw them away ("Connection pool is full")
+        max_workers = min(max_workers, HTTP_POOL_MAXSIZE)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda image_path: self.locate(image_path, context_info, location_guess),
+                image_paths
+            )
+            return [
+                {"image_path": image_path, "result": result}
+                for image_path, result in zip(image_paths, results)
+            ]
+
+    async def _analyze_async(
+        self,
+        client: AsyncGeminiClient,
+        image_path: str,
+        prompt: str
+    ) -> Dict[str, Any]:
+        try:
+            logger.info(f"Starting location analysis for: {image_path}")
+            # Disk and URL loading block, so keep them off the event loop
+            image_base64, mime_type = await asyncio.get_running_loop().run_in_executor(
+                None, self.image_processor.process_image, image_path,
+                self.cache_local_images
+            )
+
+            cache_key, cached = self._lookup_cache(prompt, image_base64, mime_type)
+            if cached is not None:
+                return cached
+
+            raw_response = await client.generate_content(
                 prompt=prompt,
                 image_base64=image_base64,
                 mime_type=mime_type
             )
-
-            # Parse response
             result = self.response_parser.parse_response(raw_response)
             logger.info("Location analysis completed successfully")
 
+            if cache_key is not None:
+                self.cache.set(cache_key, result)
             return result
 
-        except GeoIntelError as e:
-            # Log detailed error on the server, but avoid exposing internal messages to clients
-            error_msg = f"{type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            # Return a generic, user-safe error message without internal details
-            return {
-                "error": "GeoIntel processing error",
-                "details": type(e).__name__
-            }
         except Exception as e:
-            # Log unexpected errors with full stack trace, but return a generic message to clients
-            error_msg = f"Unexpected error: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            # Return a generic message without including the raw exception string
-            return {
-                "error": "An unexpected error occurred",
-                "details": "Internal processing error"
-            }
+            return self._error_result(e)
+
+    async def locate_async(
+        self,
+        image_path: str,
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None,
+        client: Optional[AsyncGeminiClient] = None
+    ) -> Dict[str, Any]:
+        """Async counterpart of locate().
+
+        Pass an open AsyncGeminiClient to share its connections across calls;
+        otherwise one is opened for this call. Requires the optional httpx
+        dependency (``pip install 'geointel[async]'``).
+        """
+        prompt = get_geolocation_prompt(context_info, location_guess)
+        if client is not None:
+            return await self._analyze_async(client, image_path, prompt)
+        async with AsyncGeminiClient(self.api_client) as own_client:
+            return await self._analyze_async(own_client, image_path, prompt)
+
+    async def locate_many_async(
+        self,
+        image_paths: List[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze many images concurrently over shared HTTP/2 connections.
+
+        Returns one {"image_path", "result"} entry per input path, in order.
+        Requires the optional httpx dependency (``pip install 'geointel[async]'``).
+        """
+        prompt = get_geolocation_prompt(context_info, location_guess)
+        semaphore = asyncio.Semaphore(ASYNC_MAX_CONNECTIONS)
+
+        async with AsyncGeminiClient(self.api_client) as client:
+            async def analyze(image_path: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._analyze_async(client, image_path, prompt)
+
+            results = await asyncio.gather(*[analyze(path) for path in image_paths])
+
+        return [
+            {"image_path": image_path, "result": result}
+            for image_path, result in zip(image_paths, results)
+        ]
+
+    def locate_many(
+        self,
+        image_paths: List[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Blocking wrapper around locate_many_async for synchronous callers."""
+        return asyncio.run(self.locate_many_async(image_paths, context_info, location_guess))
+
+    def locate_combined(
+        self,
+        image_paths: List[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze several images with as few API requests as possible.
+
+        Images are packed into multi-image requests of at most
+        MAX_BATCH_IMAGES images and MAX_BATCH_PAYLOAD_BYTES of base64 data.
+        Returns one {"image_path", "result"} entry per input path, in order.
+        Results are not cached, since they depend on which images share a request.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+
+        # Encode everything up front; unreadable images fail individually
+        encoded: List[Tuple[int, str, str]] = []
+        for index, image_path in enumerate(image_paths):
+            try:
+                logger.info(f"Starting location analysis for: {image_path}")
+                image_base64, mime_type = self.image_processor.process_image(
+                    image_path, self.cache_local_images
+                )
+                encoded.append((index, image_base64, mime_type))
+            except Exception as e:
+                results[index] = self._error_result(e)
+
+        for group in self._group_by_payload(encoded):
+            try:
+                prompt = get_batch_geolocation_prompt(len(group), context_info, location_guess)
+                raw_response = self.api_client.generate_batch_content(
+                    prompt=prompt,
+                    images=[(image_base64, mime_type) for _, image_base64, mime_type in group]
+                )
+                group_results = self.response_parser.parse_batch_response(raw_response, len(group))
+                logger.info(f"Batch of {len(group)} images analyzed in one request")
+            except Exception as e:
+                group_results = [self._error_result(e) for _ in group]
+
+            for (index, _, _), result in zip(group, group_results):
+                results[index] = result
+
+        return [
+            {"image_path": image_path, "result": result}
+            for image_path, result in zip(image_paths, results)
+        ]
+
+    @staticmethod
+    def _group_by_payload(
+        encoded: List[Tuple[int, str, str]]
+    ) -> List[List[Tuple[int, str, str]]]:
+        groups: List[List[Tuple[int, str, str]]] = []
+        current: List[Tuple[int, str, str]] = []
+        current_bytes = 0
+        for item in encoded:
+            size = len(item[1])
+            if current and (
+                len(current) >= MAX_BATCH_IMAGES
+                or current_bytes + size > MAX_BATCH_PAYLOAD_BYTES
+            ):
+                groups.append(current)
+                current, current_bytes = [], 0
+            current.append(item)
+            current_bytes += size
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    async def _gather_tasks(coros: List[Awaitable[Any]]) -> None:
+        """Run ``coros`` as tasks; if one fails or this is cancelled, cancel and await the rest.
+
+        A plain gather() leaves its other children running after the first
+        failure, where they would block on their queues forever.
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def locate_stream(
+        self,
+        image_paths: Iterable[str],
+        context_info: Optional[str] = None,
+        location_guess: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze many images, yielding {"image_path", "result"} as each finishes.
+
+        Loading, base64 encoding and the API call run as separate stages
+        connected by bounded queues, so one image can be downloading while
+        another is being encoded and others are waiting on Gemini. Results
+        arrive in completion order, not input order.
+        """
+        loop = asyncio.get_running_loop()
+        prompt = get_geolocation_prompt(context_info, location_guess)
+
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        encode_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        api_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        result_queue: asyncio.Queue = asyncio.Queue()
+
+        async def feed() -> None:
+            for image_path in image_paths:
+                await fetch_queue.put((image_path, image_path))
+            for _ in range(STREAM_FETCH_WORKERS):
+                await fetch_queue.put(_SENTINEL)
+
+        async def run_stage(
+            workers: int,
+            inbox: asyncio.Queue,
+            outbox: asyncio.Queue,
+            outbox_consumers: int,
+            step: Callable[[str, Any], Any]
+        ) -> None:
+            async def worker() -> None:
+                while True:
+                    item = await inbox.get()
+                    if item is _SENTINEL:
+                        return
+                    image_path, value = item
+                    try:
+                        value = await loop.run_in_executor(None, step, image_path, value)
+                    except Exception as e:
+                        # A failed image skips the remaining stages
+                        await result_queue.put((image_path, self._error_result(e)))
+                    else:
+                        await outbox.put((image_path, value))
+
+            await self._gather_tasks([worker() for _ in range(workers)])
+            for _ in range(outbox_consumers):
+                await outbox.put(_SENTINEL)
+
+        def fetch(image_path: str, _: Any) -> bytes:
+            logger.info(f"Starting location analysis for: {image_path}")
+            return self.image_processor.load_image(image_path)
+
+        def encode(image_path: str, image_data: bytes) -> Any:
+            return self.image_processor.encode_image(image_data, image_path)
+
+        def analyze(image_path: str, encoded: Any) -> Dict[str, Any]:
+            image_base64, mime_type = encoded
+            return self._analyze(image_base64, mime_type, prompt, image_path)
+
+        pipeline = asyncio.ensure_future(self._gather_tasks([
+            feed(),
+            run_stage(STREAM_FETCH_WORKERS, fetch_queue, encode_queue,
+                      STREAM_ENCODE_WORKERS, fetch),
+            run_stage(STREAM_ENCODE_WORKERS, encode_queue, api_queue,
+                      STREAM_API_WORKERS, encode),
+            run_stage(STREAM_API_WORKERS, api_queue, result_queue, 1, analyze),
+        ]))
+
+        def unblock_on_failure(future: asyncio.Future) -> None:
+            # Stages only fail on bugs, not bad images; don't leave the consumer waiting
+            if not future.cancelled() and future.exception() is not None:
+                result_queue.put_nowait(_SENTINEL)
+
+        pipeline.add_done_callback(unblock_on_failure)
+
+        try:
+            while True:
+                item = await result_queue.get()
+                if item is _SENTINEL:
+                    break
+                image_path, result = item
+                yield {"image_path": image_path, "result": result}
+            await pipeline
+        finally:
+            pipeline.cancel()
+            await asyncio.gather(pipeline, return_exceptions=True)
@@ -1,20 +1,43 @@
-import base64
-import mimetypes
+import http.cookiejar
+import mmap
+import os
+import stat as stat_module
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Dict, Hashable, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pybase64 as base64
+except ImportError:  # pragma: no cover - optional speedup
+    import base64
 
 from .config import (
+    BASE64_CHUNK_SIZE,
     DEFAULT_MIME_TYPE,
+    DOWNLOAD_BACKOFF_FACTOR,
+    DOWNLOAD_MAX_RETRIES,
+    DOWNLOAD_POOL_CONNECTIONS,
+    DOWNLOAD_POOL_MAXSIZE,
+    DOWNLOAD_RETRY_STATUS_CODES,
+    ENCODED_CACHE_MAX_BYTES,
     IMAGE_DOWNLOAD_TIMEOUT,
     MAX_IMAGE_SIZE_BYTES,
+    MIME_TYPES,
     SUPPORTED_IMAGE_FORMATS,
+    URL_PREFIXES,
 )
 from .exceptions import InvalidImageError, NetworkError
 from .logger import logger
 
+__all__ = ["ImageProcessor"]
+
 # Magic bytes for image format detection
 _MAGIC_BYTES = {
     b'\xff\xd8\xff': 'image/jpeg',
@@ -24,16 +47,110 @@ _MAGIC_BYTES = {
     b'GIF89a': 'image/gif',
 }
 
+# requests exception type -> NetworkError message for failed downloads
+_DOWNLOAD_ERROR_MESSAGES = {
+    # ConnectTimeout is also a ConnectionError; report it as a timeout
+    requests.exceptions.ConnectTimeout: "Request timed out when downloading from: {url}",
+    requests.exceptions.Timeout: "Request timed out when downloading from: {url}",
+    requests.exceptions.ConnectionError: "Connection failed for URL: {url}",
+    requests.exceptions.HTTPError: "HTTP {status} error downloading image from: {url}",
+}
+
+# Response validator header -> conditional request header that sends it back
+_CONDITIONAL_HEADERS = (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
+
+# Dotted extensions for a single str.endswith check
+_SUPPORTED_SUFFIXES = tuple(f".{ext}" for ext in SUPPORTED_IMAGE_FORMATS)
+
+
+def _create_download_session() -> requests.Session:
+    retry = Retry(
+        total=DOWNLOAD_MAX_RETRIES,
+        backoff_factor=DOWNLOAD_BACKOFF_FACTOR,
+        status_forcelist=DOWNLOAD_RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=DOWNLOAD_POOL_CONNECTIONS,
+        pool_maxsize=DOWNLOAD_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    # The session is shared by every caller (e.g. all web server users), so
+    # never keep cookies one download sets for the next
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared across calls so images from the same host reuse kept-alive connections
+_SESSION = _create_download_session()
+
+
+class _EncodedImageCache:
+    """In-memory LRU of base64-encoded images, bounded by total encoded size.
+
+    URLs are keyed by the URL and store the response's ETag / Last-Modified
+    validators; a repeat request sends a conditional GET and reuses the
+    stored base64 on 304. Local files are only cached on request, keyed by
+    (path, mtime, size), since most are read once (e.g. web upload temp files).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, str], str, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Dict[str, str], str, str]]:
+        """Return (validators, base64_data, mime_type) for ``key`` if cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        validators: Dict[str, str],
+        base64_data: str,
+        mime_type: str
+    ) -> None:
+        if len(base64_data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[key] = (validators, base64_data, mime_type)
+            self._size += len(base64_data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[1])
+
+
+_ENCODED_CACHE = _EncodedImageCache(ENCODED_CACHE_MAX_BYTES)
+
 
 class ImageProcessor:
     @staticmethod
     def is_url(path: str) -> bool:
-        parsed = urlparse(path)
-        return parsed.scheme in ("http", "https")
+        # Plain prefix check covers nearly every input; urlparse is only
+        # needed when a scheme-like "xxxx:" prefix is present
+        if path.startswith(URL_PREFIXES):
+            return True
+        if ":" not in path[:6]:
+            return False
+        return urlparse(path).scheme in ("http", "https")
 
     @staticmethod
-    def validate_image_format(path: str) -> None:
-        if ImageProcessor.is_url(path):
+    def validate_image_format(path: str, is_url: Optional[bool] = None) -> None:
+        if ImageProcessor.is_url(path) if is_url is None else is_url:
+            return
+        # Fast path for the common case of a supported extension
+        if path.lower().endswith(_SUPPORTED_SUFFIXES):
             return
 
         extension = Path(path).suffix.lstrip(".").lower()
@@ -44,7 +161,19 @@ class ImageProcessor:
             )
 
     @staticmethod
-    def detect_mime_type(image_data: bytes, filename: str = "") -> str:
+    def mime_type_from_name(filename: str, is_url: Optional[bool] = None) -> Optional[str]:
+        """Look up the MIME type for a path or URL by its extension."""
+        if is_url is None:
+            is_url = ImageProcessor.is_url(filename)
+        name = urlparse(filename).path if is_url else filename
+        return MIME_TYPES.get(Path(name).suffix.lstrip(".").lower())
+
+    @staticmethod
+    def detect_mime_type(
+        image_data: bytes,
+        filename: str = "",
+        is_url: Optional[bool] = None
+    ) -> str:
         """Detect MIME type using magic bytes first, then filename fallback."""
         # Check magic bytes (most reliable)
         for magic, mime in _MAGIC_BYTES.items():
@@ -52,34 +181,60 @@ class ImageProcessor:
                 # Extra check for WebP: RIFF header must also contain WEBP
                 if magic == b'RIFF' and image_data[8:12] != b'WEBP':
                     continue
-                logger.debug(f"Detected MIME type from magic bytes: {mime}")
+                logger.debug("Detected MIME type from magic bytes: %s", mime)
                 return mime
 
         # Fallback to filename extension
         if filename:
-            guessed, _ = mimetypes.guess_type(filename)
-            if guessed and guessed.startswith("image/"):
-                logger.debug(f"Detected MIME type from filename: {guessed}")
+            guessed = ImageProcessor.mime_type_from_name(filename, is_url)
+            if guessed:
+                logger.debug("Detected MIME type from filename: %s", guessed)
                 return guessed
 
-        logger.debug(f"Could not detect MIME type, defaulting to {DEFAULT_MIME_TYPE}")
+        logger.debug("Could not detect MIME type, defaulting to %s", DEFAULT_MIME_TYPE)
         return DEFAULT_MIME_TYPE
 
     @staticmethod
-    def _validate_size(data: bytes, source: str) -> None:
-        """Enforce image size limit."""
-        if len(data) > MAX_IMAGE_SIZE_BYTES:
-            size_mb = len(data) / (1024 * 1024)
+    def _validate_length(length: int) -> None:
+        """Enforce image size limit on a byte count."""
+        if length > MAX_IMAGE_SIZE_BYTES:
+            size_mb = length / (1024 * 1024)
             limit_mb = MAX_IMAGE_SIZE_BYTES / (1024 * 1024)
             raise InvalidImageError(
                 f"Image too large ({size_mb:.1f} MB). Maximum size is {limit_mb:.0f} MB."
             )
 
     @staticmethod
-    def download_image(url: str) -> bytes:
+    @contextmanager
+    def _download_errors(url: str) -> Iterator[None]:
+        """Translate requests exceptions raised while downloading into NetworkError."""
+        try:
+            yield
+        except requests.exceptions.RequestException as e:
+            # First match along the MRO, so subclasses such as ReadTimeout
+            # share their base class's message
+            template = next(
+                (_DOWNLOAD_ERROR_MESSAGES[cls] for cls in type(e).__mro__
+                 if cls in _DOWNLOAD_ERROR_MESSAGES),
+                "Failed to download image: {error}"
+            )
+            status = e.response.status_code if e.response is not None else "unknown"
+            raise NetworkError(template.format(url=url, status=status, error=e))
+
+    @staticmethod
+    def _open_download(
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Start a streamed GET; for conditional ``headers``, a 304 is returned as-is."""
+        logger.info(f"Downloading image from URL: {url}")
+        response = _SESSION.get(
+            url, timeout=IMAGE_DOWNLOAD_TIMEOUT, stream=True, headers=headers
+        )
+        if response.status_code == 304:
+            return response
+
         try:
-            logger.info(f"Downloading image from URL: {url}")
-            response = requests.get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
             response.raise_for_status()
 
             # Validate Content-Type is actually an image
@@ -89,37 +244,107 @@ class ImageProcessor:
                     f"URL did not return an image. Content-Type: {content_type}"
                 )
 
-            # Validate size
-            ImageProcessor._validate_size(response.content, url)
-
-            logger.debug(f"Successfully downloaded {len(response.content)} bytes")
-            return response.content
-
-        except (InvalidImageError, NetworkError):
+            # Refuse oversized images before reading any of the body
+            content_length = response.headers.get("Content-Length", "")
+            if content_length.isdigit():
+                ImageProcessor._validate_length(int(content_length))
+        except Exception:
+            response.close()
             raise
-        except requests.exceptions.Timeout:
-            raise NetworkError(f"Request timed out when downloading from: {url}")
-        except requests.exceptions.ConnectionError:
-            raise NetworkError(f"Connection failed for URL: {url}")
-        except requests.exceptions.HTTPError as e:
-            status = e.response.status_code if e.response is not None else "unknown"
-            raise NetworkError(f"HTTP {status} error downloading image from: {url}")
-        except requests.exceptions.RequestException as e:
-            raise NetworkError(f"Failed to download image: {e}")
+        return response
 
     @staticmethod
-    def load_local_image(path: str) -> bytes:
-        try:
+    def _iter_response(response: requests.Response) -> Iterator[bytes]:
+        total = 0
+        for chunk in response.iter_content(chunk_size=BASE64_CHUNK_SIZE):
+            total += len(chunk)
+            ImageProcessor._validate_length(total)
+            yield chunk
+        logger.debug("Successfully downloaded %d bytes", total)
+
+    @classmethod
+    def _process_url(cls, url: str) -> Tuple[str, str]:
+        cached = _ENCODED_CACHE.get(url)
+        conditional = None
+        if cached:
+            conditional = {
+                request_header: cached[0][response_header]
+                for response_header, request_header in _CONDITIONAL_HEADERS
+                if response_header in cached[0]
+            }
+
+        with cls._download_errors(url):
+            with cls._open_download(url, conditional) as response:
+                if response.status_code == 304 and cached:
+                    logger.debug("Image not modified, reusing cached encoding")
+                    return cached[1], cached[2]
+                base64_data, head = cls.encode_chunks(cls._iter_response(response))
+                validators = {
+                    header: response.headers[header]
+                    for header, _ in _CONDITIONAL_HEADERS
+                    if header in response.headers
+                }
+
+        mime_type = cls.detect_mime_type(head, url, is_url=True)
+        if validators:
+            _ENCODED_CACHE.put(url, validators, base64_data, mime_type)
+        return base64_data, mime_type
+
+    @classmethod
+    def _process_local(cls, path: str, use_cache: bool = False) -> Tuple[str, str]:
+        with cls._local_file_errors(path):
             logger.info(f"Loading local image: {path}")
             with open(path, "rb") as file:
-                content = file.read()
+                # One open + fstat serves the cache key, the size check and
+                # the encode, with no window for the path to change between them
+                stat = os.fstat(file.fileno())
+                # Pipes and other special files report no meaningful size or mtime
+                use_cache = use_cache and stat_module.S_ISREG(stat.st_mode)
+                # A rewritten file gets a new mtime or size, and so a new key
+                key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+                cached = _ENCODED_CACHE.get(key) if use_cache else None
+                if cached:
+                    logger.debug("Local image unchanged, reusing cached encoding")
+                    return cached[1], cached[2]
 
-            # Validate size
-            ImageProcessor._validate_size(content, path)
+                cls._validate_length(stat.st_size)
+                base64_data, head = cls._encode_file(file, stat)
 
-            logger.debug(f"Successfully loaded {len(content)} bytes")
-            return content
+        mime_type = cls.detect_mime_type(head, path, is_url=False)
+        if use_cache:
+            _ENCODED_CACHE.put(key, {}, base64_data, mime_type)
+        return base64_data, mime_type
+
+    @staticmethod
+    def download_image(url: str) -> bytes:
+        """Download ``url`` into one buffer, sized up front when the length is known.
+
+        Returns a bytearray; chunks are copied in as they arrive, so they are
+        never held alongside the assembled image.
+        """
+        with ImageProcessor._download_errors(url):
+            with ImageProcessor._open_download(url) as response:
+                length = response.headers.get("Content-Length", "")
+                # Content-Length counts encoded bytes when the body is compressed
+                if length.isdigit() and "Content-Encoding" not in response.headers:
+                    buffer = bytearray(int(length))
+                else:
+                    buffer = bytearray()
+                filled = 0
+                for chunk in ImageProcessor._iter_response(response):
+                    # Overwrites the pre-sized space, or grows past its end
+                    end = filled + len(chunk)
+                    buffer[filled:end] = chunk
+                    filled = end
+                del buffer[filled:]
+                return buffer
 
+    @staticmethod
+    @contextmanager
+    def _local_file_errors(path: str) -> Iterator[None]:
+        """Translate errors raised while reading a local image into InvalidImageError."""
+        try:
+            yield
         except InvalidImageError:
             raise
         except FileNotFoundError:
@@ -129,21 +354,100 @@ class ImageProcessor:
         except Exception as e:
             raise InvalidImageError(f"Failed to read image file: {e}")
 
+    @staticmethod
+    def _encode_file(file: BinaryIO, stat: os.stat_result) -> Tuple[str, bytes]:
+        """Base64-encode an open file, from a read-only memory map when it is a regular file."""
+        size = stat.st_size
+        if not (stat_module.S_ISREG(stat.st_mode) and size):
+            # Pipes, FIFOs and /proc entries report size 0 and can't be mapped;
+            # read them the plain way, bounded by the size limit
+            data = file.read(MAX_IMAGE_SIZE_BYTES + 1)
+            ImageProcessor._validate_length(len(data))
+            logger.debug("Successfully loaded %d bytes", len(data))
+            return ImageProcessor.encode_to_base64(data), data[:16]
+
+        fd = file.fileno()
+        if hasattr(os, "posix_fadvise"):
+            # The encoder reads front to back; let the kernel read ahead
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            base64_data = base64.b64encode(mapped).decode("ascii")
+            head = mapped[:16]
+
+        logger.debug("Successfully loaded %d bytes", size)
+        return base64_data, head
+
+    @staticmethod
+    def load_local_image(path: str) -> bytes:
+        with ImageProcessor._local_file_errors(path):
+            logger.info(f"Loading local image: {path}")
+            with open(path, "rb") as file:
+                # Check the size before reading, then read it all in one go
+                ImageProcessor._validate_length(os.fstat(file.fileno()).st_size)
+                content = file.read()
+            # Pipes report size 0 up front, so check what was actually read
+            ImageProcessor._validate_length(len(content))
+
+            logger.debug("Successfully loaded %d bytes", len(content))
+            return content
+
     @staticmethod
     def encode_to_base64(image_data: bytes) -> str:
-        return base64.b64encode(image_data).decode("utf-8")
+        # Base64 output is pure ASCII, which decodes faster than UTF-8
+        return base64.b64encode(image_data).decode("ascii")
+
+    @staticmethod
+    def encode_chunks(chunks: Iterable[bytes]) -> Tuple[str, bytes]:
+        """Base64-encode a stream of chunks; returns (base64_data, leading_bytes).
+
+        Each raw chunk is dropped as soon as it is encoded, so the full image
+        and its base64 copy are never held in memory together.
+        """
+        encoded = bytearray()
+        head = b""
+        carry = b""
+        for chunk in chunks:
+            if len(head) < 16:  # Enough for detect_mime_type's magic bytes
+                head += chunk[:16 - len(head)]
+            if carry:
+                chunk = carry + chunk
+            # Only whole 3-byte groups encode without padding mid-stream
+            cut = len(chunk) - len(chunk) % 3
+            encoded += base64.b64encode(chunk[:cut])
+            carry = chunk[cut:]
+        if carry:
+            encoded += base64.b64encode(carry)
+        return encoded.decode("ascii"), head
 
     @classmethod
-    def process_image(cls, image_path: str) -> Tuple[str, str]:
-        """Process image and return (base64_data, mime_type) tuple."""
-        cls.validate_image_format(image_path)
+    def load_image(cls, image_path: str) -> bytes:
+        """Validate the path and return the raw image bytes from disk or URL."""
+        is_url = cls.is_url(image_path)
+        cls.validate_image_format(image_path, is_url)
 
-        if cls.is_url(image_path):
-            image_data = cls.download_image(image_path)
-        else:
-            image_data = cls.load_local_image(image_path)
+        if is_url:
+            return cls.download_image(image_path)
+        return cls.load_local_image(image_path)
 
+    @classmethod
+    def encode_image(cls, image_data: bytes, image_path: str = "") -> Tuple[str, str]:
+        """Encode raw image bytes and return (base64_data, mime_type) tuple."""
         mime_type = cls.detect_mime_type(image_data, image_path)
         base64_data = cls.encode_to_base64(image_data)
 
         return base64_data, mime_type
+
+    @classmethod
+    def process_image(cls, image_path: str, cache_local: bool = False) -> Tuple[str, str]:
+        """Process image and return (base64_data, mime_type) tuple.
+
+        URL encodings are always cached and revalidated; pass ``cache_local``
+        to also keep encodings of local files that will be read again.
+        """
+        # Classify the path once and pass the answer down
+        is_url = cls.is_url(image_path)
+        cls.validate_image_format(image_path, is_url)
+
+        if is_url:
+            return cls._process_url(image_path)
+        return cls._process_local(image_path, cache_local)
@@ -1,4 +1,5 @@
 import logging
+import logging.handlers
 import sys
 from typing import Optional
 
@@ -6,7 +7,8 @@ from typing import Optional
 def setup_logger(
     name: str = "geointel",
     level: int = logging.INFO,
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    buffer_size: int = 0
 ) -> logging.Logger:
   
     logger = logging.getLogger(name)
@@ -22,17 +24,22 @@ def setup_logger(
     )
 
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [logging.StreamHandler(sys.stdout)]
 
     # File handler if specified
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(logging.FileHandler(log_file))
+
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        if buffer_size > 0:
+            # Write records out in batches; errors flush immediately and
+            # logging.shutdown() drains whatever is left at exit
+            handler = logging.handlers.MemoryHandler(
+                buffer_size, flushLevel=logging.ERROR, target=handler
+            )
+        logger.addHandler(handler)
 
     return logger
 
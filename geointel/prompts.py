@@ -1,8 +1,6 @@
-def get_geolocation_prompt(
-    context_info: str = "",
-    location_guess: str = ""
-) -> str:
-    base_prompt = """You are an expert geolocation analyst. Your task is to determine the precise geographic location shown in an image using a systematic, hierarchical chain-of-thought methodology.
+from functools import lru_cache
+
+_BASE_PROMPT = """You are an expert geolocation analyst. Your task is to determine the precise geographic location shown in an image using a systematic, hierarchical chain-of-thought methodology.
 
 You MUST respond with a valid JSON object in the following format:
 
@@ -132,12 +130,60 @@ Before finalizing your answer:
 6. Keep the "interpretation" field SHORT — maximum 3-5 sentences. Summarize the key visual clues and your conclusion. Do NOT repeat the full phase-by-phase analysis here. Think of it as a brief analyst's note.
 7. Keep each location's "explanation" field to 2-3 sentences summarizing the strongest evidence."""
 
+_CLOSING_REMINDER = "\n\nRemember: Your response must be a valid JSON object only. No additional text or formatting."
+
+_BATCH_SECTION_TEMPLATE = """
+
+=== MULTIPLE IMAGES ===
+
+This request contains {image_count} images, numbered 1 to {image_count} in the order they appear. They are unrelated unless the evidence says otherwise: apply the full methodology to EACH image independently.
+
+Instead of a single object, respond with ONE JSON object in this format, with exactly one entry per image in the same order:
+
+{{
+  "results": [
+    {{
+      "image_index": 1,
+      "interpretation": "...",
+      "locations": [ ... same location format as above ... ]
+    }}
+  ]
+}}"""
+
+
+# Most calls pass neither context nor a guess
+_DEFAULT_PROMPT = _BASE_PROMPT + _CLOSING_REMINDER
+
+
+# Callers often repeat the same hints across a batch
+@lru_cache(maxsize=128)
+def get_geolocation_prompt(
+    context_info: str = "",
+    location_guess: str = ""
+) -> str:
+    if not context_info and not location_guess:
+        return _DEFAULT_PROMPT
+
+    # One join instead of growing the ~6 KB base prompt with repeated +=
+    parts = [_BASE_PROMPT]
+
     if context_info:
-        base_prompt += f"\n\nAdditional context provided by the user:\n{context_info}"
+        parts.append(f"\n\nAdditional context provided by the user:\n{context_info}")
 
     if location_guess:
-        base_prompt += f"\n\nUser suggests this might be in: {location_guess}"
+        parts.append(f"\n\nUser suggests this might be in: {location_guess}")
+
+    parts.append(_CLOSING_REMINDER)
+
+    return "".join(parts)
 
-    base_prompt += "\n\nRemember: Your response must be a valid JSON object only. No additional text or formatting."
 
-    return base_prompt
+def get_batch_geolocation_prompt(
+    image_count: int,
+    context_info: str = "",
+    location_guess: str = ""
+) -> str:
+    # Same instructions as the single-image prompt, plus the batch section
+    return get_geolocation_prompt(context_info, location_guess) + _BATCH_SECTION_TEMPLATE.format(
+        image_count=image_count
+    )
@@ -1,45 +1,103 @@
-import json
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List
 
 from .config import CONFIDENCE_LEVELS
 from .exceptions import ResponseParsingError
+from .json_utils import JSONDecodeError, loads
 from .logger import logger
 
+__all__ = ["ResponseParser"]
+
+# Markdown code fences the model wraps its JSON in, with any language tag
+# ("json", "JSON", ...) and the newline after it; stripped in one pass
+_FENCE_RE = re.compile(r"```\w*\n?")
+
+# Fields a location must have to be kept, and the accepted confidence values
+_REQUIRED_LOCATION_FIELDS = ("country", "city", "confidence")
+_CONFIDENCE_SET = frozenset(CONFIDENCE_LEVELS)
+
+# Decode errors that suggest the model's output was cut short, as worded
+# by the stdlib json module and by orjson
+_TRUNCATION_HINTS = (
+    "Unterminated string",
+    "Expecting",
+    "unexpected end of data",
+    "unexpected character",
+)
+
 
 class ResponseParser:
 
     @staticmethod
     def clean_json_string(text: str) -> str:
-      
-        return text.replace("```json", "").replace("```", "").strip()
+        text = text.strip()
+        # Fences almost always wrap the whole response, so peel them off the
+        # ends without scanning the body
+        if text.startswith("```"):
+            newline = text.find("\n")
+            if newline != -1:
+                text = text[newline + 1:]
+        if text.endswith("```"):
+            text = text[:-3]
+        text = text.strip()
+
+        # Fences elsewhere (e.g. prose around the block) still get removed
+        if "```" in text:
+            text = _FENCE_RE.sub("", text).strip()
+        return text
+
+    @staticmethod
+    def extract_json_text(text: str) -> str:
+        """Clean a response and trim it to the outermost JSON object if prose surrounds it."""
+        # Bare JSON is the common case; skip the fence scan over the whole body
+        stripped = text.strip()
+        if stripped[:1] + stripped[-1:] in ("{}", "[]"):
+            return stripped
+
+        text = ResponseParser.clean_json_string(stripped)
+        if text[:1] + text[-1:] in ("{}", "[]"):
+            return text
+
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end > start:
+            return text[start:end + 1]
+        return text
+
+    @classmethod
+    def extract_and_parse_json(cls, text: str) -> Any:
+        """Decode the JSON payload of a model response (orjson when installed)."""
+        return loads(cls.extract_json_text(text))
 
     @staticmethod
     def validate_location(location: Dict[str, Any]) -> bool:
      
-        required_fields = ["country", "city", "confidence"]
-        return all(field in location for field in required_fields)
+        return all(field in location for field in _REQUIRED_LOCATION_FIELDS)
 
     @staticmethod
     def normalize_confidence(confidence: str) -> str:
        
         confidence = confidence.strip().capitalize()
-        return confidence if confidence in CONFIDENCE_LEVELS else "Medium"
+        return confidence if confidence in _CONFIDENCE_SET else "Medium"
 
     @staticmethod
     def normalize_location(location: Dict[str, Any]) -> Dict[str, Any]:
        
+        get = location.get
+        # Only build the placeholder coordinates when they are actually missing
+        if "coordinates" in location:
+            coordinates = location["coordinates"]
+        else:
+            coordinates = {"latitude": 0.0, "longitude": 0.0}
         return {
-            "country": location.get("country", "Unknown"),
-            "state": location.get("state", ""),
-            "city": location.get("city", "Unknown"),
+            "country": get("country", "Unknown"),
+            "state": get("state", ""),
+            "city": get("city", "Unknown"),
             "confidence": ResponseParser.normalize_confidence(
-                location.get("confidence", "Medium")
+                get("confidence", "Medium")
             ),
-            "coordinates": location.get("coordinates", {
-                "latitude": 0.0,
-                "longitude": 0.0
-            }),
-            "explanation": location.get("explanation", "")
+            "coordinates": coordinates,
+            "explanation": get("explanation", "")
         }
 
     @staticmethod
@@ -55,7 +113,7 @@ class ResponseParser:
             for closing in ['"}]}', '"}]', '"}', '}]}', '}]', '}']:
                 try:
                     repaired = json_string + closing
-                    data = json.loads(repaired)
+                    data = loads(repaired)
                     # Validate the repaired data has required structure
                     if "locations" in data and data["locations"]:
                         return {
@@ -66,7 +124,7 @@ class ResponseParser:
                                 if ResponseParser.validate_location(loc)
                             ]
                         }
-                except (json.JSONDecodeError, KeyError):
+                except (JSONDecodeError, KeyError):
                     continue
         
         # Try to extract partial location data even if incomplete
@@ -113,42 +171,95 @@ class ResponseParser:
         }
 
     @classmethod
-    def parse_response(cls, raw_response: str) -> Dict[str, Any]:
+    def parse_result_data(cls, data: Dict[str, Any]) -> Dict[str, Any]:
        
-        try:
-            # Clean and parse JSON
-            json_string = cls.clean_json_string(raw_response)
-            logger.debug("Parsing JSON response")
-            data = json.loads(json_string)
-
+        # Standard format first: one lookup on the common path
+        locations = data.get("locations")
+        if locations is None:
             # Check for legacy format (single location not in array)
             if "city" in data and "locations" not in data:
                 return cls.parse_legacy_format(data)
+            raise ResponseParsingError("Response missing 'locations' field")
 
-            # Validate standard format
-            if "locations" not in data:
-                raise ResponseParsingError("Response missing 'locations' field")
+        # Normalize locations
+        normalized_locations = [
+            cls.normalize_location(loc)
+            for loc in locations
+            if cls.validate_location(loc)
+        ]
 
-            # Normalize locations
-            normalized_locations = [
-                cls.normalize_location(loc)
-                for loc in data.get("locations", [])
-                if cls.validate_location(loc)
-            ]
+        if not normalized_locations:
+            raise ResponseParsingError("No valid locations found in response")
 
-            if not normalized_locations:
-                raise ResponseParsingError("No valid locations found in response")
+        return {
+            "interpretation": data.get("interpretation", ""),
+            "locations": normalized_locations
+        }
+
+    @classmethod
+    def parse_batch_response(cls, raw_response: str, image_count: int) -> List[Dict[str, Any]]:
+        """Split a multi-image response into one result per image, in input order.
+
+        Images the model skipped or answered with invalid data get an error
+        entry instead of failing the whole batch.
+        """
+        try:
+            data = cls.extract_and_parse_json(raw_response)
+        except JSONDecodeError as e:
+            logger.error(f"Batch JSON parsing failed: {e}")
+            raise ResponseParsingError(f"Failed to parse batch API response as JSON: {e}")
+
+        entries = data.get("results") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ResponseParsingError("Batch response missing 'results' array")
+
+        results: List[Dict[str, Any]] = [
+            {"error": "GeoIntel processing error", "details": "ResponseParsingError"}
+            for _ in range(image_count)
+        ]
+        # Use the model's own 1-based indices when it gave any; array position
+        # is only trusted when no entry is indexed, so the two never mix
+        indexed = any(isinstance(entry, dict) and "image_index" in entry for entry in entries)
+        claimed = set()
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            if indexed:
+                index = entry.get("image_index")
+                if index is None:
+                    logger.warning(f"Skipping batch entry {position + 1} without image_index")
+                    continue
+            else:
+                index = position + 1
+            if isinstance(index, bool) or not isinstance(index, int) or not 1 <= index <= image_count:
+                logger.warning(f"Skipping batch entry with invalid image_index {index!r}")
+                continue
+            if index in claimed:
+                logger.warning(f"Ignoring duplicate result for image {index} in batch")
+                continue
+            claimed.add(index)
+            try:
+                results[index - 1] = cls.parse_result_data(entry)
+            except ResponseParsingError as e:
+                logger.error(f"Invalid result for image {index} in batch: {e}")
+
+        return results
+
+    @classmethod
+    def parse_response(cls, raw_response: str) -> Dict[str, Any]:
+       
+        try:
+            # Clean and parse JSON
+            logger.debug("Parsing JSON response")
+            data = cls.extract_and_parse_json(raw_response)
 
-            return {
-                "interpretation": data.get("interpretation", ""),
-                "locations": normalized_locations
-            }
+            return cls.parse_result_data(data)
 
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             logger.error(f"JSON parsing failed: {e}")
             
             # Check if this might be a truncated response
-            if "Unterminated string" in str(e) or "Expecting" in str(e):
+            if any(hint in str(e) for hint in _TRUNCATION_HINTS):
                 logger.error("Response appears to be truncated. Attempting to repair JSON...")
                 
                 # Try to repair truncated JSON
@@ -6,11 +6,14 @@ from pathlib import Path
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 
-from .config import AVAILABLE_MODELS
+from .config import AVAILABLE_MODELS, MIME_TYPES, URL_PREFIXES
 from .geointel import GeoIntel
 from .exceptions import GeoIntelError
 from .logger import logger
 
+# MIME type -> temp file suffix; later entries win, so image/jpeg maps to .jpg
+_MIME_SUFFIXES = {mime: f".{ext}" for ext, mime in MIME_TYPES.items()}
+
 
 def create_app(host: str = '127.0.0.1', port: int = 5000) -> Flask:
 
@@ -100,11 +103,11 @@ def analyze_image():
         logger.info("Processing image analysis request")
 
         # Determine if image_data is URL or base64
-        if image_data.startswith(('http://', 'https://')):
+        if image_data.startswith(URL_PREFIXES):
             image_path = image_data
 
             # Initialize GeoIntel with provided API key and model
-            geointel = GeoIntel(api_key=api_key, model=model)
+            geointel = GeoIntel(api_key=api_key, model=model, cache=False)
 
             # Perform analysis
             result = geointel.locate(
@@ -120,12 +123,8 @@ def analyze_image():
                 if ',' in image_data:
                     header, image_data = image_data.split(',', 1)
                     # Extract MIME type from data URI (e.g. data:image/png;base64)
-                    if 'image/png' in header:
-                        suffix = '.png'
-                    elif 'image/webp' in header:
-                        suffix = '.webp'
-                    elif 'image/gif' in header:
-                        suffix = '.gif'
+                    mime_type = header.partition(':')[2].partition(';')[0].lower()
+                    suffix = _MIME_SUFFIXES.get(mime_type, suffix)
 
                 image_bytes = base64.b64decode(image_data)
 
@@ -150,7 +149,7 @@ def analyze_image():
                 image_path = temp_path
 
                 # Initialize GeoIntel with provided API key and model
-                geointel = GeoIntel(api_key=api_key, model=model)
+                geointel = GeoIntel(api_key=api_key, model=model, cache=False)
 
                 # Perform analysis
                 result = geointel.locate(
@@ -26,6 +26,13 @@ setup(
             "flask>=2.3.0",
             "flask-cors>=4.0.0",
         ],
+        "fast": [
+            "orjson>=3.9.0",
+            "pybase64>=1.3.0",
+        ],
+        "async": [
+            "httpx[http2]>=0.24.0",
+        ],
     },
     python_requires=">=3.8",
     entry_points={